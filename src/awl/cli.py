@@ -1,9 +1,10 @@
 import atexit
-import importlib
+import functools
+import importlib.metadata
 import logging
+import shutil
 import sys
 import tempfile
-import tomllib
 from collections.abc import Generator
 from pathlib import Path
 
@@ -22,52 +23,49 @@ def get_console() -> Console:
     return getattr(sys, "_awl_console", _default_console)
 
 
-def get_metadata() -> dict[str, str]:
-    pyproject_path = Path(__file__).parent.parent.parent / "pyproject.toml"
-    description: str = "description unavailable."
-    if pyproject_path.exists():
-        try:
-            with pyproject_path.open("rb") as f:
-                data = tomllib.load(f)
-            description = data["project"]["description"]
-
-        except (tomllib.TOMLDecodeError, KeyError) as e:
-            get_console().print(f"[yellow]⚠ Could not read project metadata: {e}[/yellow]")
+@functools.lru_cache(maxsize=1)
+def _get_version() -> str:
     try:
-        version = importlib.metadata.version("awl")
+        return importlib.metadata.version("awl")
     except Exception:
-        version = __version__
-    return {
-        "name": "awl",
-        "description": description,
-        "version": version,
-    }
-
-
-def read_stdin(fmt: type[str | bytes] = str, chunk_size: int = 8192) -> Generator[str | bytes]:
-    while True:
-        chunk = sys.stdin.read(chunk_size) if fmt is str else sys.stdin.buffer.read(chunk_size)
-        if not chunk:
-            break
+        return __version__
+
+
+def read_stdin(fmt: type[str | bytes] = str, chunk_size: int = 1 << 16) -> Generator[str | bytes]:
+    return _read_stdin_str(chunk_size) if fmt is str else _read_stdin_bytes(chunk_size)
+
+
+def _read_stdin_str(chunk_size: int) -> Generator[str]:
+    while chunk := sys.stdin.read(chunk_size):
+        yield chunk
+
+
+def _read_stdin_bytes(chunk_size: int) -> Generator[bytes]:
+    while chunk := sys.stdin.buffer.read(chunk_size):
         yield chunk
 
 
-def read_stdin_to_tempfile(fmt: type[str | bytes] = str, chunk_size: int = 8192) -> Path:
+def read_stdin_to_tempfile(fmt: type[str | bytes] = str, chunk_size: int = 1 << 20) -> Path:
     with tempfile.NamedTemporaryFile(delete=False) as temp_file:
         temp_path = Path(temp_file.name).resolve()
     atexit.register(lambda: temp_path.unlink(missing_ok=True))
 
+    if fmt is str:
+        # Text mode translates newlines, as reading sys.stdin always has; newline="" writes them untouched.
+        with temp_path.open("w", encoding="utf-8", newline="") as f:
+            shutil.copyfileobj(sys.stdin, f, length=chunk_size)
+        return temp_path
+
     with temp_path.open("wb") as f:
-        for data in read_stdin(fmt, chunk_size):
-            bytes_chunk = data.encode() if isinstance(data, str) else data
-            f.write(bytes_chunk)
+        shutil.copyfileobj(sys.stdin.buffer, f, length=chunk_size)
     return temp_path
 
 
 def _resolve_input_path(pos_input: str | Path, input_path: str | Path) -> Path | str | None:
+    console = get_console()
     input_path = input_path or pos_input
     if input_path and pos_input:
-        get_console().print(
+        console.print(
             "[yellow]Warning: both input flag and positional input provided; using --input/-i[/yellow]"
         )
 
@@ -75,11 +73,11 @@ def _resolve_input_path(pos_input: str | Path, input_path: str | Path) -> Path |
         return None
 
     if input_path == "-":
-        return read_stdin_to_tempfile(fmt=str)
+        return read_stdin_to_tempfile(fmt=bytes)
 
     path = Path(input_path)
     if not path.exists():
-        get_console().print(f"[red]Error: Input file does not exist: {path}[/red]")
+        console.print(f"[red]Error: Input file does not exist: {path}[/red]")
         sys.exit(1)
 
     return path
@@ -90,60 +88,70 @@ def _run_awl(
     *,
     dry_run: bool,
     verbose: bool,
+    jobs: int = 1,
 ) -> list[dict]:
-    return core_main(str(input_path) if input_path else None, dry_run=dry_run, verbose=verbose)
+    return core_main(str(input_path) if input_path else None, dry_run=dry_run, verbose=verbose, jobs=jobs)
 
 
 def _render_results(result, verbose, dry_run):
+    console = get_console()
+    lines: list[str] = []
     for entry in result:
         status = entry.get("status")
         file_path = entry.get("file")
 
         if status == "error" and entry.get("reason") == "no-pyproject":
-            get_console().print("[red]❌ No pyproject.toml found and no path was given.[/red]")
+            lines.append("[red]❌ No pyproject.toml found and no path was given.[/red]")
+            _flush_lines(console, lines)
             sys.exit(1)
 
         if status == "skip":
             reason = entry.get("reason")
             if reason == "wildcard":
-                get_console().print(f"[yellow]⚠ Skipped {file_path} due to wildcard import.[/yellow]")
+                lines.append(f"[yellow]⚠ Skipped {file_path} due to wildcard import.[/yellow]")
             elif reason == "ignore":
-                get_console().print(f"[cyan]⏭ Skipped {file_path} (marked with # awl:ignore)[/cyan]")
+                lines.append(f"[cyan]⏭ Skipped {file_path} (marked with # awl:ignore)[/cyan]")
             continue
 
         if verbose:
-            get_console().rule(f"[bold]{file_path}[/bold]")
+            _flush_lines(console, lines)
+            console.rule(f"[bold]{file_path}[/bold]")
             old_all = entry.get("old_all")
             new_all = entry.get("new_all")
-            get_console().print(f"[dim]Old __all__:[/dim] {old_all}")
-            get_console().print(f"[green]New __all__:[/green] {new_all}")
+            lines.append(f"[dim]Old __all__:[/dim] {old_all}")
+            lines.append(f"[green]New __all__:[/green] {new_all}")
 
         if entry.get("reason") == "Multiple __all__ assignments":
-            get_console().print(f"[yellow]⚠ Multiple __all__ assignments in {file_path}; skipping.[/yellow]")
+            lines.append(f"[yellow]⚠ Multiple __all__ assignments in {file_path}; skipping.[/yellow]")
 
         if status == "unchanged":
-            get_console().print(f"[green]✓ {file_path} — up to date[/green]")
+            lines.append(f"[green]✓ {file_path} — up to date[/green]")
         elif status == "changed":
             msg = "📝 Dry run: would update" if dry_run else "🔁 Updated __all__ in"
-            get_console().print(f"[blue]{msg} {file_path}[/blue]")
+            lines.append(f"[blue]{msg} {file_path}[/blue]")
+    _flush_lines(console, lines)
+
+
+def _flush_lines(console: Console, lines: list[str]) -> None:
+    if lines:
+        console.print("\n".join(lines))
+        lines.clear()
 
 
 def _print_stdin_contents(input_path):
     if isinstance(input_path, Path):
+        console = get_console()
         try:
-            get_console().print(input_path.read_text(encoding="utf-8"))
+            console.print(input_path.read_text(encoding="utf-8"))
         except OSError as e:
-            get_console().print(f"[red]Error reading temporary file: {e}[/red]")
+            console.print(f"[red]Error reading temporary file: {e}[/red]")
             sys.exit(1)
 
 
 def _print_version(ctx, param, value):
     if not value or ctx.resilient_parsing:
         return
-    meta = get_metadata()
-    name = meta.get("name", "awl")
-    version = meta.get("version", __version__)
-    click.echo(f"{name}, version {version}")
+    click.echo(f"awl, version {_get_version()}")
     ctx.exit()
 
 
@@ -159,6 +167,14 @@ def _print_version(ctx, param, value):
 @click.option("-d", "--dry-run", is_flag=True, help="Show what would change, but do not write any files.")
 @click.option("-v", "--verbose", is_flag=True, help="Show old and new __all__ values for all files.")
 @click.option("-q", "--quiet", is_flag=True, help="Suppress non-critical output.")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes; only worth raising for projects with thousands of packages.",
+)
 @click.option(
     "-V",
     "--version",
@@ -169,13 +185,13 @@ def _print_version(ctx, param, value):
     callback=_print_version,
     help="Show version and exit",
 )
-def main(pos_input, input_path, dry_run, verbose, quiet):
+def main(pos_input, input_path, dry_run, verbose, quiet, jobs):
     """Awl — keep __all__ declarations in sync with imports."""
     level = logging.WARNING if quiet else (logging.DEBUG if verbose else logging.INFO)
     logging.basicConfig(level=level, format="%(message)s")
 
     resolved_input = _resolve_input_path(pos_input, input_path)
-    result = _run_awl(resolved_input, dry_run=dry_run, verbose=verbose)
+    result = _run_awl(resolved_input, dry_run=dry_run, verbose=verbose, jobs=jobs)
     _render_results(result, verbose, dry_run)
     try:
         _print_stdin_contents(resolved_input)
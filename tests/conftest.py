@@ -7,6 +7,7 @@ import pytest
 from rich.console import Console
 
 import awl.cli
+import awl.core
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
@@ -32,6 +33,17 @@ def patch_console(monkeypatch):
     return stream
 
 
+@pytest.fixture
+def forbid_parse(monkeypatch):
+    """Fail the test if awl parses any source."""
+
+    def fail_parse(*_args, **_kwargs):
+        msg = "source should not be parsed"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(awl.core, "_parse_module", fail_parse)
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_runtest_logreport(report: pytest.TestReport) -> None:
     """Limit captured output per test."""
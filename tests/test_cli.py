@@ -1,5 +1,7 @@
+import io
 import re
 
+import pytest
 from click.testing import CliRunner
 
 import awl
@@ -138,18 +140,62 @@ def test_cli_stdin_print_error(monkeypatch, patch_console):
     assert "Error reading temporary file: broken file" in output
 
 
-def test_cli_invalid_pyproject(monkeypatch, tmp_path, patch_console):
-    pyproject = tmp_path / "pyproject.toml"
-    pyproject.write_text("not really a toml file")
-    monkeypatch.chdir(tmp_path)
-
-    # Prevent version lookup from crashing
+def test_cli_version_uses_installed_metadata(monkeypatch):
+    awl.cli._get_version.cache_clear()
     monkeypatch.setattr("importlib.metadata.version", lambda name: "0.1.0")
 
     runner = CliRunner()
     result = runner.invoke(cli_main, ["--version"])
 
     assert result.exit_code == 0
+    assert "awl, version 0.1.0" in result.output
+    awl.cli._get_version.cache_clear()
 
-    output = strip_ansi(patch_console.getvalue())
-    assert "Could not read project metadata" in output
+
+def test_read_stdin_to_tempfile_copies_bytes(monkeypatch):
+    payload = "from .foo import bär\n".encode() * 10_000
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8"))
+    temp_path = awl.cli.read_stdin_to_tempfile(fmt=bytes)
+    assert temp_path.read_bytes() == payload
+
+
+def test_read_stdin_to_tempfile_text_translates_newlines(monkeypatch):
+    payload = "from .foo import bär\r\n".encode() * 10_000
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8"))
+    temp_path = awl.cli.read_stdin_to_tempfile(fmt=str)
+    assert temp_path.read_bytes() == payload.replace(b"\r\n", b"\n")
+
+
+def test_render_results_single_write(tmp_path, monkeypatch):
+    calls = []
+
+    class RecordingConsole:
+        def print(self, text):
+            calls.append(text)
+
+    monkeypatch.setattr(awl.cli, "get_console", RecordingConsole)
+    results = [{"status": "unchanged", "file": tmp_path / f"pkg{i}" / "__init__.py"} for i in range(3)]
+    awl.cli._render_results(results, verbose=False, dry_run=False)
+
+    assert len(calls) == 1
+    assert calls[0].count("up to date") == 3
+
+
+@pytest.mark.parametrize(("fmt", "expected"), [(str, "abcdef"), (bytes, b"abcdef")])
+def test_read_stdin_formats(monkeypatch, fmt, expected):
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(b"abcdef"), encoding="utf-8"))
+    chunks = list(awl.cli.read_stdin(fmt, chunk_size=4))
+    assert all(isinstance(chunk, fmt) for chunk in chunks)
+    assert expected[:0].join(chunks) == expected
+
+
+def test_cli_jobs_option(tmp_path):
+    init_file = tmp_path / "__init__.py"
+    init_file.write_text("from .foo import bar\n")
+    runner = CliRunner()
+    result = runner.invoke(cli_main, ["-j", "2", str(init_file)])
+    assert result.exit_code == 0
+    assert '__all__ = ["bar"]' in init_file.read_text()
+
+    result = runner.invoke(cli_main, ["--jobs", "0", str(init_file)])
+    assert result.exit_code != 0
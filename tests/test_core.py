@@ -1,4 +1,5 @@
 import ast
+import os
 from pathlib import Path
 
 import pytest
@@ -212,3 +213,288 @@ from .foo import _baz
     tree = ast.parse(code)
     names = find_public_names(tree, flags)
     assert names == []
+
+
+@pytest.mark.usefixtures("forbid_parse")
+def test_update_dunder_all_reuses_parsed_source(tmp_path):
+    file = tmp_path / "__init__.py"
+    code = "from .foo import bar\n"
+    file.write_text(code)
+    tree = ast.parse(code)
+    changed, _reason = update_dunder_all(file, ["bar"], code=code, tree=tree)
+    assert changed is True
+    assert '__all__ = ["bar"]' in file.read_text()
+
+
+def test_parse_control_flags_single_pass():
+    code = "\n" * 5 + "from .foo import _bar  # awl:include-private # awl:exclude-public\n"
+    result = parse_control_flags(code)
+    assert result["file"] == {"ignore_file": False, "include_private": False, "exclude_public": False}
+    assert result["lines"] == {6: {"include_private", "exclude_public"}}
+
+
+def test_update_dunder_all_splices_in_place(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_text('from .foo import bar\n__all__ = [\n    "old",\n]\nVALUE = 1\n')
+    changed, _reason = update_dunder_all(file, ["bar"])
+    assert changed is True
+    assert file.read_text() == 'from .foo import bar\n__all__ = ["bar"]\nVALUE = 1\n'
+
+
+@pytest.mark.usefixtures("forbid_parse")
+def test_process_file_skips_parse_for_blank_file(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_text("\n")
+    result = core.process_file(file)
+    assert result["status"] == "changed"
+    assert result["new_all"] == []
+    assert file.read_text() == "\n__all__ = []\n"
+
+
+def test_process_file_syntax_error_without_imports(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_text("def broken(:\n    pass\n")
+    with pytest.raises(SyntaxError):
+        core.process_file(file)
+    assert file.read_text() == "def broken(:\n    pass\n"
+
+
+def test_process_file_rereads_same_size_edit(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_text('from .foo import bar\n__all__ = ["bar"]\n')
+    assert core.process_file(file)["status"] == "unchanged"
+
+    stat = file.stat()
+    file.write_text('from .foo import baz\n__all__ = ["bar"]\n')
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    result = core.process_file(file)
+    assert result["status"] == "changed"
+    assert result["new_all"] == ["baz"]
+
+
+def test_find_public_names_line_ignore():
+    code = """
+from .foo import bar  # awl:ignore
+from .foo import baz
+"""
+    flags = parse_control_flags(code)
+    names = find_public_names(ast.parse(code), flags)
+    assert names == ["baz"]
+
+
+def test_collect_init_files_prunes_tool_dirs(tmp_path):
+    for rel in ("pkg", "pkg/sub", "pkg/build", "pkg/__pycache__", "pkg/.hidden", "pkg/.venv/dep"):
+        (tmp_path / rel).mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel / "__init__.py").write_text("")
+    found = core.collect_init_files(tmp_path / "pkg")
+    assert sorted(found) == [
+        tmp_path / "pkg" / "__init__.py",
+        tmp_path / "pkg" / "build" / "__init__.py",
+        tmp_path / "pkg" / "sub" / "__init__.py",
+    ]
+
+
+def test_collect_init_files_skips_unreadable_dirs(tmp_path, monkeypatch):
+    for rel in ("pkg", "pkg/sub", "pkg/locked"):
+        (tmp_path / rel).mkdir(parents=True)
+        (tmp_path / rel / "__init__.py").write_text("")
+    locked = str(tmp_path / "pkg" / "locked")
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if path == locked:
+            raise PermissionError(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(core.os, "scandir", scandir)
+    found = core.collect_init_files(tmp_path / "pkg")
+    assert sorted(found) == [tmp_path / "pkg" / "__init__.py", tmp_path / "pkg" / "sub" / "__init__.py"]
+
+
+def test_collect_init_files_missing_dir(tmp_path):
+    assert core.collect_init_files(tmp_path / "missing") == []
+
+
+def test_core_main_batch_serial_by_default(tmp_path, monkeypatch):
+    (tmp_path / "pyproject.toml").write_text('[tool.hatch.build]\nincludes = ["src/mypkg/**"]\n')
+    inits = []
+    for i in range(40):
+        pkg = tmp_path / "src" / "mypkg" / f"sub{i}"
+        pkg.mkdir(parents=True)
+        init = pkg / "__init__.py"
+        init.write_text(f"from .mod import val{i}\n")
+        inits.append(init)
+
+    def fail_pool(*_args, **_kwargs):
+        msg = "a process pool should only be used when jobs are requested"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(core, "ProcessPoolExecutor", fail_pool)
+    monkeypatch.chdir(tmp_path)
+    results = core.main(None)
+    assert len(results) == len(inits)
+    assert all(result["status"] == "changed" for result in results)
+    for i, init in enumerate(inits):
+        assert f'__all__ = ["val{i}"]' in init.read_text()
+
+
+def test_classify_module_single_pass():
+    tree = ast.parse('import os\nfrom .foo import bar\n__all__ = ["bar"]\nVALUE = 1\n')
+    imports, assigns, has_wildcard = core._classify_module(tree)
+    assert [type(node) for node in imports] == [ast.Import, ast.ImportFrom]
+    assert len(assigns) == 1
+    assert has_wildcard is False
+
+    _imports, _assigns, has_wildcard = core._classify_module(ast.parse("from .foo import *\n"))
+    assert has_wildcard is True
+
+
+def test_line_range_offsets():
+    code = "a = 1\r\n__all__ = [\n    'x',\n]\nb = 2\n"
+    start, end = core._line_range_offsets(code, 2, 4)
+    assert code[start:end] == "__all__ = [\n    'x',\n]\n"
+    assert core._line_range_offsets("x = 1", 1, 1) == (0, 5)
+
+
+def test_find_public_names_dotted_import():
+    code = "import os.path\nimport _thread.stuff  # awl:include-private\n"
+    names = find_public_names(ast.parse(code), parse_control_flags(code))
+    assert names == ["_thread", "os"]
+
+
+def test_parse_control_flags_without_directives():
+    result = parse_control_flags("from .foo import bar\n# awl is not a directive here\n")
+    assert result == {
+        "file": {"ignore_file": False, "include_private": False, "exclude_public": False},
+        "lines": {},
+    }
+
+
+def test_get_src_dirs_reloads_changed_pyproject(tmp_path):
+    proj = tmp_path / "pyproject.toml"
+    proj.write_text('[tool.hatch.build]\nincludes = ["src/pkg1/**"]\n')
+    assert core.get_src_dirs(proj) == [Path("src/pkg1")]
+    assert core.get_src_dirs(proj) == [Path("src/pkg1")]
+
+    proj.write_text('[tool.hatch.build]\nincludes = ["src/pkg2/**"]\n')
+    stat = proj.stat()
+    os.utime(proj, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert core.get_src_dirs(proj) == [Path("src/pkg2")]
+
+    # An edit that changes the size is picked up even when the mtime does not move.
+    stat = proj.stat()
+    proj.write_text('[tool.hatch.build]\nincludes = ["src/pkg10/**"]\n')
+    os.utime(proj, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert core.get_src_dirs(proj) == [Path("src/pkg10")]
+
+
+def test_process_file_parses_once(tmp_path, monkeypatch):
+    file = tmp_path / "__init__.py"
+    file.write_text('from .foo import bar\n__all__ = ["old"]\n')
+    calls = []
+    real_parse = core._parse_module
+
+    def counting_parse(*args, **kwargs):
+        calls.append(args)
+        return real_parse(*args, **kwargs)
+
+    monkeypatch.setattr(core, "_parse_module", counting_parse)
+    result = core.process_file(file, verbose=True)
+    assert result["status"] == "changed"
+    assert len(calls) == 1
+
+
+def test_parse_control_flags_line_numbers_match_ast():
+    code = "import a\r\n\x0cimport b\rfrom .c import d  # awl:ignore\n"
+    flags = parse_control_flags(code)
+    tree = ast.parse(code)
+    assert flags["lines"] == {tree.body[2].lineno: {"ignore"}}
+    assert find_public_names(tree, flags) == ["a", "b"]
+
+
+def test_parse_control_flags_fast_path_returns_fresh_flags():
+    first = parse_control_flags("from .foo import bar\n")
+    first["file"]["ignore_file"] = True
+    first["lines"][1] = {"ignore"}
+    second = parse_control_flags("from .foo import bar\n")
+    assert second["file"]["ignore_file"] is False
+    assert second["lines"] == {}
+
+
+def test_process_file_wildcard_skips_decoding(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_bytes("# -*- coding: latin-1 -*-\nfrom .foo import *\nNAME = 'caf\xe9'\n".encode("latin-1"))
+    result = core.process_file(file)
+    assert result["status"] == "skip"
+    assert result["reason"] == "wildcard"
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_core_main_jobs(tmp_path, monkeypatch, jobs):
+    (tmp_path / "pyproject.toml").write_text('[tool.hatch.build]\nincludes = ["src/mypkg/**"]\n')
+    for i in range(3):
+        pkg = tmp_path / "src" / "mypkg" / f"sub{i}"
+        pkg.mkdir(parents=True)
+        (pkg / "__init__.py").write_text(f"from .mod import val{i}\n")
+
+    monkeypatch.chdir(tmp_path)
+    results = core.main(None, jobs=jobs)
+    assert sorted(result["new_all"] for result in results) == [["val0"], ["val1"], ["val2"]]
+
+
+def test_import_filter_matches_find_public_names():
+    header = "# awl:include-private\n" + "\n" * 5
+    code = header + (
+        "from .a import _x, y\nfrom .b import z  # awl:exclude-public\nfrom .c import w  # awl:ignore\n"
+    )
+    flags = parse_control_flags(code)
+    name_filter = core.ImportFilter(flags)
+    assert name_filter.should_include("_x", 7)
+    assert name_filter.should_include("y", 7)
+    assert not name_filter.should_include("z", 8)
+    assert name_filter.should_include("_z", 8)
+    assert not name_filter.should_include("w", 9)
+    assert find_public_names(ast.parse(code), flags) == ["_x", "y"]
+
+
+@pytest.mark.parametrize("names", [[], ["a"], ["a" * 50, "b" * 51], ["a" * 50, "b" * 52], ["x"] * 30])
+def test_format_new_block_line_length_boundary(names):
+    inline = f"__all__ = [{', '.join(f'"{name}"' for name in names)}]\n"
+    block = core._format_new_block(names)
+    if len(inline) <= 120:
+        assert block == inline
+    else:
+        assert block.startswith("__all__ = [\n")
+        assert block.count("\n") == len(names) + 2
+
+
+def test_process_file_syntax_error_names_file(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_text("from .foo import (bar\n")
+    with pytest.raises(SyntaxError) as excinfo:
+        core.process_file(file)
+    assert excinfo.value.filename == str(file)
+
+
+def test_process_file_crlf_up_to_date(tmp_path):
+    file = tmp_path / "__init__.py"
+    content = b'from .foo import bar\r\n__all__ = ["bar"]\r\n'
+    file.write_bytes(content)
+    result = core.process_file(file)
+    assert result["status"] == "unchanged"
+    assert file.read_bytes() == content
+
+
+def test_process_file_crlf_keeps_line_endings(tmp_path):
+    file = tmp_path / "__init__.py"
+    file.write_bytes(b"from .foo import bar\r\nfrom .baz import qux\r\n__all__ = []\r\nVALUE = 1\r\n")
+    assert core.process_file(file)["status"] == "changed"
+    assert file.read_bytes() == (
+        b'from .foo import bar\r\nfrom .baz import qux\r\n__all__ = ["bar", "qux"]\r\nVALUE = 1\r\n'
+    )
+
+    appended = tmp_path / "pkg" / "__init__.py"
+    appended.parent.mkdir()
+    appended.write_bytes(b"from .foo import bar\r\n")
+    core.process_file(appended)
+    assert appended.read_bytes() == b'from .foo import bar\r\n__all__ = ["bar"]\r\n'